@@ -15,6 +15,7 @@ from .manager import TaskManager, AsyncTaskManager
 from .util import (
     read_txt_file_lines,
     write_txt_file,
+    flush_txt_files,
     get_session,
     get_async_session,
     raise_response_error,
@@ -24,7 +25,7 @@ from .util import (
 
 __version__ = '1.0.6'
 
-__all__ = [
+__all__ = (
     'Target',
     'TaskManager',
     'AsyncTaskManager',
@@ -33,23 +34,27 @@ __all__ = [
     'AsyncXiaoboTask',
     'read_txt_file_lines',
     'write_txt_file',
+    'flush_txt_files',
     'get_session',
     'get_async_session',
     'raise_response_error',
     'parse_cloudflare_error',
     'json_get',
-]
+)
 
-# 自动加载 .env 文件
-load_dotenv()
+# 模块被 reload 时全局变量会保留，借此避免重复读取 .env 与重复配置日志
+if not globals().get('_configured', False):
+    # 自动加载 .env 文件
+    load_dotenv()
 
-# --- 日志配置 ---
-# 移除默认的 logger，添加自定义格式的 logger
-logger.remove()
-logger.add(
-    sys.stderr,
-    format="<green>{time:HH:mm:ss.SSS}</green> | <level>{level: <7}</level> | <cyan>[{extra[name]}]</cyan> - <level>{message}</level>",
-    colorize=True,
-    backtrace=False
-)
-logger.configure(extra={"name": "MainApp"})
+    # --- 日志配置 ---
+    # 移除默认的 logger，添加自定义格式的 logger
+    logger.remove()
+    logger.add(
+        sys.stderr,
+        format="<green>{time:HH:mm:ss.SSS}</green> | <level>{level: <7}</level> | <cyan>[{extra[name]}]</cyan> - <level>{message}</level>",
+        colorize=None,  # 由 loguru 根据是否为 TTY 及 NO_COLOR/FORCE_COLOR 自动决定是否着色
+        backtrace=False,
+    )
+    logger.configure(extra={"name": "MainApp"})
+    _configured = True
@@ -422,6 +422,10 @@ class XiaoboTask(BaseTask):
                 self._manager.wait(wait_callbacks)
             except (KeyboardInterrupt, futures.CancelledError):
                 self.logger.error("用户强制中断，程序退出！")
+                try:
+                    util.flush_txt_files()  # os._exit 不会执行 atexit，需手动写入排队中的文件内容
+                except IOError as e:
+                    self.logger.error(str(e))
                 os._exit(0)
 
     def shutdown(self, wait: bool = True, cancel_tasks: bool = False, wait_callbacks: bool = True):
@@ -491,22 +495,32 @@ class AsyncXiaoboTask(BaseTask):
         然后将包装好的函数提交给底层的 TaskManager。
         """
 
-        async def _run_callback(cb: Callable[..., Any], *args):
-            result = cb(*args)
-            if inspect.isawaitable(result):
-                await result
+        # 提交时一次性判断回调类型，协程函数直接 await；其余回调仍检查返回值是否可等待
+        success_is_coro = inspect.iscoroutinefunction(on_success)
+        error_is_coro = inspect.iscoroutinefunction(on_error)
+        cancel_is_coro = inspect.iscoroutinefunction(on_cancel)
 
         async def on_task_success(t: Target, result: Any):
             await self._increment_stat("success")
             t.logger.success(f"✅ [{target.data_preview}]任务执行成功")
             if on_success:
-                await _run_callback(on_success, t, result)
+                if success_is_coro:
+                    await on_success(t, result)
+                else:
+                    callback_result = on_success(t, result)
+                    if inspect.isawaitable(callback_result):
+                        await callback_result
 
         async def on_task_cancel(t: Target):
             await self._increment_stat("cancel")
             t.logger.warning(f"⏹️ [{target.data_preview}]任务取消")
             if on_cancel:
-                await _run_callback(on_cancel, t)
+                if cancel_is_coro:
+                    await on_cancel(t)
+                else:
+                    callback_result = on_cancel(t)
+                    if inspect.isawaitable(callback_result):
+                        await callback_result
 
         async def on_task_error(t: Target, error: Exception):
             if isinstance(error, asyncio.CancelledError):
@@ -530,7 +544,12 @@ class AsyncXiaoboTask(BaseTask):
                 self._errors.append(error_text)
 
             if on_error:
-                await _run_callback(on_error, t, error)
+                if error_is_coro:
+                    await on_error(t, error)
+                else:
+                    callback_result = on_error(t, error)
+                    if inspect.isawaitable(callback_result):
+                        await callback_result
 
         def _refresh_proxy(replacement: Optional[str] = None, use_proxy_ipv6: Optional[bool] = None):
             replacement_text = (replacement if replacement is not None else f'{target.data_preview}({time.time()})')
@@ -593,6 +612,10 @@ class AsyncXiaoboTask(BaseTask):
                 await self._manager.wait(wait_callbacks)
             except (KeyboardInterrupt, asyncio.CancelledError):
                 self.logger.error("用户强制中断，程序退出！")
+                try:
+                    util.flush_txt_files()  # os._exit 不会执行 atexit，需手动写入排队中的文件内容
+                except IOError as e:
+                    self.logger.error(str(e))
                 os._exit(0)
 
     async def shutdown(self, wait: bool = True, cancel_tasks: bool = False, wait_callbacks: bool = True):
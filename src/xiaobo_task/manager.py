@@ -1,5 +1,8 @@
 import asyncio
 import inspect
+import itertools
+import os
+import sys
 import threading
 from abc import abstractmethod, ABC
 from asyncio import Task
@@ -10,10 +13,162 @@ from typing import Callable, Any, Optional, overload, Awaitable
 from xiaobo_task.domain import Target
 
 
+def _trace_and_run_callback(callbacks: set, callback: Callable[..., None], *args):
+    """执行同步回调，并在执行期间将其登记到 callbacks 中以便等待。"""
+    callback_future = Future()
+    callbacks.add(callback_future)
+    try:
+        callback(*args)
+        callback_future.set_result(True)
+    except Exception as e:
+        if not callback_future.done():
+            callback_future.set_exception(e)
+    finally:
+        callbacks.discard(callback_future)
+
+
+class _TaskCallbacks:
+    """任务完成回调，直接作为 add_done_callback 的回调对象。
+
+    使用 __slots__ 保存回调参数，每个任务只分配一个对象，代替闭包。
+    """
+    __slots__ = ('callbacks', 'target', 'on_success', 'on_error', 'on_cancel')
+
+    def __init__(
+            self,
+            callbacks: set,
+            target: Optional[Target],
+            on_success: Optional[Callable[[Target, Any], None]],
+            on_error: Optional[Callable[[Target, Exception], None]],
+            on_cancel: Optional[Callable[[Target], None]],
+    ):
+        self.callbacks = callbacks
+        self.target = target
+        self.on_success = on_success
+        self.on_error = on_error
+        self.on_cancel = on_cancel
+
+    def __call__(self, future: Future):
+        try:
+            result = future.result()
+            if self.on_success:
+                self._invoke(self.on_success, self.target, result)
+        except (CancelledError, asyncio.CancelledError):
+            if self.on_cancel:
+                self._invoke(self.on_cancel, self.target)
+        except Exception as e:
+            if self.on_error:
+                self._invoke(self.on_error, self.target, e)
+
+    def _invoke(self, callback: Callable[..., None], *args):
+        _trace_and_run_callback(self.callbacks, callback, *args)
+
+
+class _AsyncTaskCallbacks(_TaskCallbacks):
+    """asyncio.Task 的完成回调。
+
+    含协程函数回调时在新的 Task 中 await 各回调；否则直接在完成回调中执行，无需再创建一个 Task。
+    """
+    __slots__ = ('success_is_coro', 'error_is_coro', 'cancel_is_coro')
+
+    def __init__(
+            self,
+            callbacks: set,
+            target: Optional[Target],
+            on_success: Optional[Callable[[Target, Any], Awaitable | None]],
+            on_error: Optional[Callable[[Target, Exception], Awaitable | None]],
+            on_cancel: Optional[Callable[[Target], Awaitable | None]],
+            success_is_coro: bool,
+            error_is_coro: bool,
+            cancel_is_coro: bool,
+    ):
+        super().__init__(callbacks, target, on_success, on_error, on_cancel)
+        self.success_is_coro = success_is_coro
+        self.error_is_coro = error_is_coro
+        self.cancel_is_coro = cancel_is_coro
+
+    def __call__(self, task: Task):
+        if self.success_is_coro or self.error_is_coro or self.cancel_is_coro:
+            asyncio.create_task(self._run(task))
+        else:
+            super().__call__(task)
+
+    def _invoke(self, callback: Callable[..., Awaitable | None], *args):
+        """内联执行非协程函数回调；若其返回可等待对象（如 lambda 包装的协程），交给新的 Task 等待。"""
+        callback_future = asyncio.get_running_loop().create_future()
+        self.callbacks.add(callback_future)
+        try:
+            result = callback(*args)
+            if inspect.isawaitable(result):
+                asyncio.ensure_future(self._await_traced(result, callback_future))
+                return
+            callback_future.set_result(True)
+        except Exception as e:
+            callback_future.set_exception(e)
+        self.callbacks.discard(callback_future)
+
+    async def _await_traced(self, awaitable: Awaitable, callback_future: asyncio.Future):
+        try:
+            await awaitable
+            callback_future.set_result(True)
+        except Exception as e:
+            callback_future.set_exception(e)
+        finally:
+            self.callbacks.discard(callback_future)
+
+    async def _run(self, task: Task):
+        try:
+            result = task.result()
+            if self.on_success:
+                await self._trace_and_run_callback(self.on_success, self.success_is_coro, self.target, result)
+        except asyncio.CancelledError:
+            if self.on_cancel:
+                await self._trace_and_run_callback(self.on_cancel, self.cancel_is_coro, self.target)
+        except Exception as e:
+            if self.on_error:
+                await self._trace_and_run_callback(self.on_error, self.error_is_coro, self.target, e)
+
+    async def _trace_and_run_callback(self, callback: Callable[..., Awaitable | None], is_coro: bool, *args):
+        callback_future = asyncio.wrap_future(Future())
+        self.callbacks.add(callback_future)
+        try:
+            if is_coro:
+                await callback(*args)
+            else:
+                # 非协程函数也可能返回可等待对象（如 lambda 包装的协程、异步 __call__ 对象）
+                callback_result = callback(*args)
+                if inspect.isawaitable(callback_result):
+                    await callback_result
+            callback_future.set_result(True)
+        except Exception as e:
+            if not callback_future.done():
+                callback_future.set_exception(e)
+        finally:
+            self.callbacks.discard(callback_future)
+
+
+def _pin_worker(cpus: list[int], counter: itertools.count):
+    """线程池初始化函数：按轮询方式将工作线程绑定到 CPU，减少线程在核心间迁移。"""
+    try:
+        os.sched_setaffinity(0, {cpus[next(counter) % len(cpus)]})
+    except OSError:
+        pass
+
+
+class _XiaoboTask(asyncio.Task):
+    """带 started 槽位的 Task，标记任务是否真正开始执行，用于优雅取消。"""
+    __slots__ = ('started',)
+
+    def __init__(self, coro, *, loop=None, name=None):
+        super().__init__(coro, loop=loop, name=name)
+        self.started = False
+
+
 class BaseTaskManager(ABC):
     def __init__(self, max_workers: Optional[int] = None):
         if max_workers is not None and max_workers <= 0:
             raise ValueError("max_workers 必须为正整数或 None。")
+        self.max_workers = max_workers
         self._tasks = set()
         self._callbacks = set()
 
@@ -75,9 +230,28 @@ class BaseTaskManager(ABC):
 class TaskManager(BaseTaskManager):
     """通用同步任务池管理器"""
 
-    def __init__(self, max_workers: Optional[int] = None):
+    def __init__(self, max_workers: Optional[int] = None, pin_workers: bool = False):
+        """
+        参数:
+            max_workers (Optional[int]): 最大线程数，None 时按 CPU 数自动计算。
+            pin_workers (bool): 是否在 Linux 下将每个工作线程绑定到单个 CPU，默认关闭；
+                                绑定后由任务启动的子进程也会继承该 CPU 亲和性。
+        """
         super().__init__(max_workers)
-        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        # 任务以网络 IO 为主，未指定时按 CPU 数放大线程数，避免受 ThreadPoolExecutor 默认上限限制
+        if max_workers is None:
+            self.max_workers = min(64, (os.cpu_count() or 1) * 8)
+        if pin_workers and sys.platform.startswith('linux'):
+            # Linux 下的 CPU 亲和性以线程为单位，pid 0 即当前工作线程
+            initializer, initargs = _pin_worker, (sorted(os.sched_getaffinity(0)), itertools.count())
+        else:
+            initializer, initargs = None, ()
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="xiaobo",
+            initializer=initializer,
+            initargs=initargs,
+        )
         self._callback_lock = threading.Lock()
 
     def submit_task(
@@ -98,38 +272,11 @@ class TaskManager(BaseTaskManager):
             on_cancel (Optional[Callable]): 任务被取消时调用的回调函数。
         """
 
-        def _trace_and_run_callback(callback: Callable[..., None], *args):
-            callback_future = Future()
-            self._callbacks.add(callback_future)
-            try:
-                callback(*args)
-                callback_future.set_result(True)
-            except Exception as e:
-                if not callback_future.done():
-                    callback_future.set_exception(e)
-            finally:
-                self._callbacks.discard(callback_future)
-
-        def _task_done_callback(_future: Future):
-            try:
-                result = _future.result()
-                if on_success:
-                    _trace_and_run_callback(on_success, target, result)
-                    # on_success(target, result)
-            except CancelledError:
-                if on_cancel:
-                    _trace_and_run_callback(on_cancel, target)
-                    # on_cancel(target)
-            except Exception as e:
-                if on_error:
-                    _trace_and_run_callback(on_error, target, e)
-                    # on_error(target, e)
-            return
-
         future = self.executor.submit(task_func)
-        future.add_done_callback(lambda f: _task_done_callback(f))
-        future.add_done_callback(lambda t: self._tasks.discard(t))
         self._tasks.add(future)
+        if on_success or on_error or on_cancel:
+            future.add_done_callback(_TaskCallbacks(self._callbacks, target, on_success, on_error, on_cancel))
+        future.add_done_callback(self._tasks.discard)
         return future
 
     def wait(self, wait_callbacks: bool = True):
@@ -169,6 +316,18 @@ class AsyncTaskManager(BaseTaskManager):
         super().__init__(max_workers)
         self.sem = asyncio.Semaphore(max_workers) if max_workers else None
         self._callback_lock = asyncio.Lock()
+        # 在初始化时选定执行方式，避免每个任务都判断是否需要信号量
+        self._runner = self._run_with_sem if self.sem else self._run_no_sem
+
+    async def _run_with_sem(self, task_func: Callable[..., Awaitable]):
+        async with self.sem:
+            asyncio.current_task().started = True
+            return await task_func()
+
+    @staticmethod
+    async def _run_no_sem(task_func: Callable[..., Awaitable]):
+        asyncio.current_task().started = True
+        return await task_func()
 
     def submit_task(
             self,
@@ -187,47 +346,19 @@ class AsyncTaskManager(BaseTaskManager):
             on_error (Optional[Callable]): 任务执行过程中发生异常时调用的回调函数。
             on_cancel (Optional[Callable]): 任务被取消时调用的回调函数。
         """
+        success_is_coro = inspect.iscoroutinefunction(on_success)
+        error_is_coro = inspect.iscoroutinefunction(on_error)
+        cancel_is_coro = inspect.iscoroutinefunction(on_cancel)
 
-        async def _run_with_semaphore():
-            current = asyncio.current_task()
-            if self.sem:
-                async with self.sem:
-                    current.started = True
-                    return await task_func()
-            current.started = True
-            return await task_func()
-
-        async def _trace_and_run_callback(callback: Callable[..., Awaitable | None], *args):
-            callback_future = asyncio.wrap_future(Future())
-            self._callbacks.add(callback_future)
-            try:
-                callback_result = callback(*args)
-                if inspect.isawaitable(callback_result):
-                    await callback_result
-                callback_future.set_result(True)
-            except Exception as e:
-                if not callback_future.done():
-                    callback_future.set_exception(e)
-            finally:
-                self._callbacks.discard(callback_future)
-
-        async def _task_done_callback(_task: Task):
-            try:
-                result = task.result()
-                if on_success:
-                    await _trace_and_run_callback(on_success, target, result)
-            except asyncio.CancelledError:
-                if on_cancel:
-                    await _trace_and_run_callback(on_cancel, target)
-            except Exception as e:
-                if on_error:
-                    await _trace_and_run_callback(on_error, target, e)
-
-        task = asyncio.create_task(_run_with_semaphore())
-        task.started = False  # 标记任务是否真正开始执行，用于优雅取消
-        task.add_done_callback(lambda t: asyncio.create_task(_task_done_callback(t)))
-        task.add_done_callback(lambda t: self._tasks.discard(t))
+        task = _XiaoboTask(self._runner(task_func), loop=asyncio.get_running_loop())
         self._tasks.add(task)
+        # 先从任务集合中移除，再执行回调，保证回调执行时已完成的任务不在 _tasks 中
+        task.add_done_callback(self._tasks.discard)
+        if on_success or on_error or on_cancel:
+            task.add_done_callback(_AsyncTaskCallbacks(
+                self._callbacks, target, on_success, on_error, on_cancel,
+                success_is_coro, error_is_coro, cancel_is_coro,
+            ))
         return task
 
     async def wait(self, wait_callbacks: bool = True):
@@ -245,10 +376,11 @@ class AsyncTaskManager(BaseTaskManager):
 
     async def shutdown(self, wait: bool = True, cancel_tasks: bool = False, wait_callbacks: bool = True):
         """关闭任务池"""
-        tasks = set(self._tasks)
-        if cancel_tasks:
-            for task in tasks:
-                if not task.done() and not task.started:
+        if cancel_tasks and self._tasks:
+            # cancel() 触发的完成回调由事件循环稍后调度，遍历期间集合不会被修改，无需复制；
+            # 对已完成的任务 cancel() 直接返回 False，无需预先检查 done()
+            for task in self._tasks:
+                if not task.started:
                     task.cancel()
 
         if wait:
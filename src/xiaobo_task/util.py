@@ -2,9 +2,13 @@
 """
 通用工具模块
 """
+import atexit
 import json
+import os
 import re
 import threading
+import time
+from collections import OrderedDict, defaultdict, deque
 from typing import List, Optional, NoReturn
 from pathlib import Path
 import sys
@@ -12,20 +16,46 @@ import sys
 from curl_cffi import BrowserTypeLiteral, Session, AsyncSession, Response
 from curl_cffi.requests.exceptions import HTTPError
 from curl_cffi.requests.impersonate import DEFAULT_CHROME
-
-# 进程内文件锁表，避免多线程写同一文件时竞争
-_thread_file_locks: dict[Path, threading.Lock] = {}
-_file_locks_guard = threading.Lock()
+from loguru import logger
+
+# 进程内写入队列，按文件路径缓存待写入的 (append, 内容)，由后台线程批量写入
+_write_queues: defaultdict[Path, deque[tuple[bool, bytes]]] = defaultdict(deque)
+_write_queues_guard = threading.Lock()
+# 保证同一时刻只有一次刷新，避免多次刷新之间写入顺序错乱
+_flush_lock = threading.Lock()
+_flush_event = threading.Event()
+_flusher: Optional[threading.Thread] = None
+# fork 出的子进程中为 True：子进程可能经 os._exit 退出而跳过 atexit，改为同步写入
+_sync_writes = False
+# 后台线程被唤醒后等待的时间，用于攒批
+_FLUSH_INTERVAL = 0.01
+# write_txt_file 默认分隔符的 bytes 形式
+_DEFAULT_SEP = b'----'
+# 不超过该大小的追加写入使用 os.write，POSIX 下 O_APPEND 小块写入是原子的
+_SMALL_APPEND_SIZE = 4096
+_APPEND_FLAGS = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, 'O_BINARY', 0)
+
+# 线程内 Session 缓存（get_session(reuse=True)），每个线程最多保留 _SESSION_CACHE_SIZE 个，超出时移出最久未使用的
+_thread_local = threading.local()
+_SESSION_CACHE_SIZE = 8
+
+# 读取结果缓存: path -> (st_mtime_ns, st_size, lines)，超出容量时淘汰最早加入的
+_read_cache: dict[Path, tuple[int, int, List[str]]] = {}
+_read_cache_lock = threading.Lock()
+_READ_CACHE_SIZE = 16
+
+# 入口脚本所在目录，导入时解析一次，避免每次读写文件都重复 resolve
+_ENTRY_DIR = Path(sys.argv[0]).resolve().parent
 
 
 def _resolve_txt_path(filename: str, create_file: bool = False) -> Path:
     """补全 .txt 后缀并将相对路径定位到脚本目录，缺失时回退到脚本父目录同级 data 目录。"""
-    if not filename.lower().endswith('.txt'):
+    if filename[-4:].lower() != '.txt':
         filename += '.txt'
 
     path = Path(filename)
     if not path.is_absolute():
-        entry_dir = Path(sys.argv[0]).resolve().parent
+        entry_dir = _ENTRY_DIR
         primary = entry_dir / path
         if primary.exists():
             path = primary
@@ -48,17 +78,43 @@ def _resolve_txt_path(filename: str, create_file: bool = False) -> Path:
     return path
 
 
-def _get_thread_lock(path: Path) -> threading.Lock:
-    """为目标路径获取/创建一个进程内线程锁。"""
-    with _file_locks_guard:
-        lock = _thread_file_locks.get(path)
-        if lock is None:
-            lock = threading.Lock()
-            _thread_file_locks[path] = lock
-        return lock
+def _flush_loop():
+    """后台刷新线程：有新数据写入时被唤醒，稍作等待以攒批后统一写入。"""
+    while True:
+        _flush_event.wait()
+        time.sleep(_FLUSH_INTERVAL)
+        _flush_event.clear()
+        try:
+            flush_txt_files()
+        except Exception as e:
+            logger.error(f"后台写入文件时发生错误: {e}")
+
+
+def _ensure_flusher():
+    """按需启动后台刷新线程，需在持有 _write_queues_guard 时调用。"""
+    global _flusher
+    if _flusher is None:
+        _flusher = threading.Thread(target=_flush_loop, name="xiaobo-txt-flusher", daemon=True)
+        _flusher.start()
+
+
+def _reset_after_fork():
+    """fork 后子进程中不存在后台刷新线程，重建队列与锁，并改为同步写入。"""
+    global _write_queues, _write_queues_guard, _flush_lock, _flush_event, _flusher, _sync_writes
+    # 继承自父进程的待写入内容由父进程负责写入，子进程丢弃以免重复
+    _write_queues = defaultdict(deque)
+    _write_queues_guard = threading.Lock()
+    _flush_lock = threading.Lock()
+    _flush_event = threading.Event()
+    _flusher = None
+    _sync_writes = True
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
 
 
-def read_txt_file_lines(filename: str) -> List[str]:
+def read_txt_file_lines(filename: str, use_cache: bool = True) -> List[str]:
     """
     读取txt文件内容并按行返回一个列表。
 
@@ -67,8 +123,11 @@ def read_txt_file_lines(filename: str) -> List[str]:
     - 优先读取脚本目录下的文件；不存在则读取脚本父目录同级的 data 目录。
     - 按行读取文件，并去除每行两侧的空白字符（包括换行符）。
     - 返回一个包含文件中所有非空行的字符串列表。
+    - use_cache 为 True 时，文件未修改（修改时间与大小不变）则直接返回缓存结果的副本；
+      文件系统修改时间精度较低且文件在同一时刻内被改写为相同大小时可能读到旧内容，此时请传入 False。
 
     :param filename: 要读取的txt文件名。
+    :param use_cache: 是否使用读取结果缓存，默认 True。
     :return: 包含文件所有行的字符串列表。
     :raises FileNotFoundError: 如果文件未找到。
     :raises IOError: 如果发生其他读取错误。
@@ -76,10 +135,25 @@ def read_txt_file_lines(filename: str) -> List[str]:
     path = _resolve_txt_path(filename)
 
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            # 使用列表推导式高效读取，并只保留非空行
-            lines = [line.strip() for line in f if line.strip()]
-        return lines
+        # 先写入该文件排队中的内容，保证读到最新数据；其他文件的写入仍交给后台线程
+        _flush_path(path)
+        with open(path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            cached = _read_cache.get(path) if use_cache else None
+            if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+                return list(cached[2])
+            # 二进制一次性读取后再按行切分，避免逐行迭代与文本模式换行转换的开销
+            data = f.read()
+        # map/filter 在 C 层完成逐行 strip 与空行过滤
+        # 仅按 \n 切分（splitlines 还会切分 \x0b、\x1c、\u2028 等字符），\r 由 strip 去除
+        lines = list(filter(None, map(str.strip, data.decode('utf-8').split('\n'))))
+        if not use_cache:
+            return lines
+        with _read_cache_lock:
+            if len(_read_cache) >= _READ_CACHE_SIZE and path not in _read_cache:
+                _read_cache.pop(next(iter(_read_cache)), None)
+            _read_cache[path] = (stat.st_mtime_ns, stat.st_size, lines)
+        return list(lines)
     except FileNotFoundError:
         raise FileNotFoundError(f"读取文件 '{path}' 时发生错误: 未找到文件")
     except Exception as e:
@@ -96,6 +170,11 @@ def write_txt_file(filename: str, data: str | List[str], append: bool = True, se
     - data 支持字符串或字符串列表，列表会用分隔符拼接后写入。
     - append 为 True 时追加写入，否则覆盖写入，默认 True。
     - separator 控制列表拼接时的分隔符，默认 "----"。
+    - 内容先进入进程内队列，由后台线程批量写入；需要立即落盘时调用 flush_txt_files()。
+    - 因为是后台写入，写入失败不会在此处抛出，而是由后台线程记录错误日志；
+      需要感知写入错误时请调用 flush_txt_files()，它会抛出 IOError。
+    - 程序通过 os._exit 退出时不会执行 atexit，退出前需手动调用 flush_txt_files()。
+    - fork 出的子进程（如 multiprocessing）中同步写入，写入失败时直接抛出 IOError。
 
     :param filename: 目标文件名。
     :param data: 要写入的内容，字符串或字符串列表。
@@ -103,21 +182,146 @@ def write_txt_file(filename: str, data: str | List[str], append: bool = True, se
     :param separator: data 为列表时的拼接分隔符。
     """
     path = _resolve_txt_path(filename, create_file=True)
-    lock = _get_thread_lock(path)
 
-    text = separator.join(data) if isinstance(data, list) else str(data)
-    if text and not text.endswith('\n'):
-        text += '\n'
-
-    mode = 'a' if append else 'w'
-    with lock:
+    # 直接在 bytes 层面拼接，避免先拼出完整 str 再整体编码的两次全量处理
+    if isinstance(data, list):
+        sep = _DEFAULT_SEP if separator == "----" else separator.encode('utf-8')
+        payload = sep.join([item.encode('utf-8') for item in data])
+    else:
+        payload = str(data).encode('utf-8')
+
+    with _write_queues_guard:
+        queue = _write_queues[path]
+        queue.append((append, payload))
+        if payload and not payload.endswith(b'\n'):
+            # 换行单独入队，由刷新时的 b''.join 一并拼接，避免再复制一次 payload
+            queue.append((True, b'\n'))
+        if not _sync_writes:
+            _ensure_flusher()
+    if _sync_writes:
+        _flush_path(path)
+    else:
+        _flush_event.set()
+
+
+def _write_batch(path: Path, queue: deque[tuple[bool, bytes]]) -> None:
+    """将单个文件排队中的内容合并后一次写入。"""
+    # 覆盖写入之前的内容无需落盘，从最后一次覆盖写入开始处理
+    append = True
+    chunks = []
+    for item_append, chunk in queue:
+        if not item_append:
+            append = False
+            chunks.clear()
+        chunks.append(chunk)
+    payload = b''.join(chunks)
+    try:
         path.parent.mkdir(parents=True, exist_ok=True)
-        with open(path, mode, encoding='utf-8') as f:
-            f.write(text)
+        if append and len(payload) <= _SMALL_APPEND_SIZE:
+            # 小块追加直接使用底层 fd 写入，省去缓冲写入对象的创建与关闭
+            fd = os.open(path, _APPEND_FLAGS, 0o644)
+            try:
+                # os.write 可能只写入部分数据，循环直到全部写完
+                view = memoryview(payload)
+                while view:
+                    view = view[os.write(fd, view):]
+            finally:
+                os.close(fd)
+        else:
+            with open(path, 'ab' if append else 'wb') as f:
+                f.write(payload)
+    except Exception as e:
+        raise IOError(f"写入文件 '{path}' 时发生错误: {e}")
+
 
+def _flush_path(path: Path) -> None:
+    """只写入指定文件排队中的内容；持有 _flush_lock，也会等待正在进行的刷新完成。"""
+    with _flush_lock:
+        with _write_queues_guard:
+            queue = _write_queues.pop(path, None)
+        if queue:
+            _write_batch(path, queue)
 
-def get_session(proxy: str = None, timeout: int = 30, impersonate: Optional[BrowserTypeLiteral] = DEFAULT_CHROME):
-    return Session(proxy=proxy, timeout=timeout, impersonate=impersonate)
+
+def flush_txt_files() -> None:
+    """
+    将 write_txt_file 排队中的内容立即写入文件。
+
+    后台线程会自动定期写入，程序退出时也会自动调用；
+    需要立即读取刚写入的文件时可手动调用。
+
+    :raises IOError: 如果写入某个文件时发生错误（其余文件仍会继续写入）。
+    """
+    with _flush_lock:
+        with _write_queues_guard:
+            if not _write_queues:
+                return
+            pending = dict(_write_queues)
+            _write_queues.clear()
+
+        error = None
+        for path, queue in pending.items():
+            try:
+                _write_batch(path, queue)
+            except IOError as e:
+                error = error or e
+        if error:
+            raise error
+
+
+atexit.register(flush_txt_files)
+
+
+class _ReusableSession(Session):
+    """get_session(reuse=True) 返回的 Session，被调用方关闭后不再复用。"""
+    _released = False
+
+    def close(self) -> None:
+        super().close()
+        self._released = True
+
+
+def get_session(
+        proxy: str = None,
+        timeout: int = 30,
+        impersonate: Optional[BrowserTypeLiteral] = DEFAULT_CHROME,
+        reuse: bool = False,
+):
+    """
+    获取同步 Session。
+
+    reuse 为 True 时复用当前线程中相同 (proxy, timeout, impersonate) 的 Session，避免重复初始化 curl 句柄与 TLS 指纹：
+    - 复用前会清空其 cookies 与 headers，因此同一线程内同时使用的两个 Session 不应使用相同参数；
+    - 已被关闭的 Session 会自动重建；
+    - 每个线程最多缓存 _SESSION_CACHE_SIZE 个，超出时移出缓存（不会关闭，由调用方或垃圾回收释放）。
+
+    :param proxy: 代理地址。
+    :param timeout: 超时时间（秒）。
+    :param impersonate: 模拟的浏览器指纹。
+    :param reuse: 是否复用线程内缓存的 Session，默认 False 总是新建。
+    """
+    if not reuse:
+        return Session(proxy=proxy, timeout=timeout, impersonate=impersonate)
+
+    sessions = getattr(_thread_local, 'sessions', None)
+    if sessions is None:
+        sessions = _thread_local.sessions = OrderedDict()
+
+    key = (proxy, timeout, impersonate)
+    session = sessions.get(key)
+    if session is not None and not session._released:
+        sessions.move_to_end(key)
+        session.cookies.clear()
+        session.headers.clear()
+        return session
+
+    session = _ReusableSession(proxy=proxy, timeout=timeout, impersonate=impersonate)
+    sessions[key] = session
+    sessions.move_to_end(key)
+    if len(sessions) > _SESSION_CACHE_SIZE:
+        # 仅移出缓存而不关闭，避免关闭调用方仍在使用的 Session
+        sessions.popitem(last=False)
+    return session
 
 
 def get_async_session(proxy: str = None, timeout: int = 30, impersonate: Optional[BrowserTypeLiteral] = DEFAULT_CHROME):